@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 import curses
+import mmap
 import os
+import tempfile
 import time
 import configparser
-from copy import deepcopy
+import unicodedata
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from itertools import accumulate, chain
 
 CONFIG_PATH = os.path.expanduser("~/.cleditrc")
 
@@ -15,43 +21,369 @@ DEFAULT_CONFIG = {
     }
 }
 
-CTRL = lambda x: ord(x) & 0x1f
+UNDO_LIMIT = 1000
+
+# Typing pauses longer than this (seconds) start a new undo step
+UNDO_GROUP_TIMEOUT = 1.0
+
+# Lines per chunk in SegmentList
+SEGMENT_SIZE = 256
+
+# Height of the off-screen pad backing the text area. It holds a band of
+# buffer lines around the viewport (curses caps pads at 32767 rows).
+PAD_ROWS = 1024
+
+# Minimum time between redraws while keystrokes are still queued (~60 fps)
+FRAME_INTERVAL = 0.016
+
+# Bytes of a mapped file split into lines per splitlines() call on open
+LOAD_CHUNK = 1 << 20
+
+# Idle time (seconds) after the last keystroke before autosave writes
+AUTOSAVE_DELAY = 2.0
+
+# Each undo record is (kind, cy, cx, *payload); a record is undone by
+# applying its counterpart with the same arguments.
+INVERSE_OPS = {
+    "ins_char": "del_char",
+    "del_char": "ins_char",
+    "split": "join",
+    "join": "split",
+}
+
+# path -> (mtime_ns, parser, settings); reused while the file is unchanged
+_CONFIG_CACHE = {}
+
+# Lookup table for key codes that insert themselves (printable ASCII)
+_PRINTABLE = bytes(1 if 32 <= c <= 126 else 0 for c in range(256))
+_BYTES = [bytes((c,)) for c in range(256)]
+
+CTRL_L = 0x0c
+CTRL_Q = 0x11
+CTRL_S = 0x13
+CTRL_Y = 0x19
+CTRL_Z = 0x1a
 
 MENU_ITEMS = ["File", "Edit", "Help"]
+MENU_LABELS = [f" {m} " for m in MENU_ITEMS]
+MENU_BAR = "".join(MENU_LABELS)
+MENU_OFFSETS = [1 + len("".join(MENU_LABELS[:i])) for i in range(len(MENU_ITEMS))]
+
+
+def _menu_keys(bindings):
+    # Menu letters are accepted in either case
+    return {ord(c): fn for key, fn in bindings.items() for c in (key, key.upper())}
+
+
+@lru_cache(maxsize=4096)
+def _char_width(c):
+    # Terminal cells taken by one character; curses shows controls as ^X
+    if c < " " or c == "\x7f":
+        return 2
+    if unicodedata.combining(c):
+        return 0
+    return 2 if unicodedata.east_asian_width(c) in "WF" else 1
+
+
+def _display_width(text):
+    if text.isascii() and text.isprintable():
+        return len(text)
+    return sum(map(_char_width, text))
+
+
+def _fit(text, width):
+    # Longest prefix of text that fits in width terminal cells
+    if text.isascii() and text.isprintable():
+        return text[:width]
+    used = 0
+    for i, c in enumerate(text):
+        used += _char_width(c)
+        if used > width:
+            return text[:i]
+    return text
+
+
+def _write_all(fd, data, sync):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+    if sync:
+        os.fsync(fd)
+
+
+def _split_lines(mm):
+    # bytes.splitlines() over newline-aligned blocks of the mapping, so the
+    # file is never copied whole; a block never ends inside a \r\n
+    lines = []
+    start, size = 0, len(mm)
+    while start < size:
+        end = mm.rfind(b"\n", start, start + LOAD_CHUNK) + 1
+        if not end:
+            end = mm.find(b"\n", start + LOAD_CHUNK) + 1 or size
+        lines += mm[start:end].splitlines()
+        start = end
+    return lines
+
+
+def _line_bytes(line):
+    # Lines not yet touched since loading are stored as plain bytes
+    return line if line.__class__ is bytes else line.as_bytes()
+
+
+def _load_config_cached(path):
+    mtime = os.stat(path).st_mtime_ns
+    cached = _CONFIG_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    config = configparser.ConfigParser()
+    config.read(path)
+    settings = {
+        "tab_size": int(config["editor"].get("tab_size", 4)),
+        "autosave": config["editor"].getboolean("autosave"),
+        "show_line_numbers": config["editor"].getboolean("show_line_numbers"),
+    }
+    _CONFIG_CACHE[path] = (mtime, config, settings)
+    return config, settings
+
+
+# A single line of text held as UTF-8 bytes with a gap at the last edit
+# position, so typing at the cursor does not copy the rest of the line.
+# Positions are byte offsets into the logical (gap-free) contents.
+# Lines loaded from disk are kept as plain bytes in Editor.lines and only
+# wrapped (gapless, sharing the bytes object) by Editor.line() when needed.
+class GapBuffer:
+    __slots__ = ("buf", "gap_start", "gap_end")
+
+    def __init__(self, data=b"", gap=16):
+        if gap:
+            data = bytearray(data) + bytes(gap)
+        self.buf = data
+        self.gap_start = len(data) - gap
+        self.gap_end = len(data)
+
+    def __len__(self):
+        return len(self.buf) - (self.gap_end - self.gap_start)
+
+    def __getitem__(self, pos):
+        if pos >= self.gap_start:
+            pos += self.gap_end - self.gap_start
+        return self.buf[pos]
+
+    def _own(self):
+        if isinstance(self.buf, bytes):
+            self.buf = bytearray(self.buf)
+
+    def move_gap(self, pos):
+        if self.gap_start == self.gap_end:
+            self.gap_start = self.gap_end = pos
+        elif pos < self.gap_start:
+            n = self.gap_start - pos
+            self.buf[self.gap_end - n:self.gap_end] = self.buf[pos:self.gap_start]
+            self.gap_start -= n
+            self.gap_end -= n
+        elif pos > self.gap_start:
+            n = pos - self.gap_start
+            self.buf[self.gap_start:pos] = self.buf[self.gap_end:self.gap_end + n]
+            self.gap_start += n
+            self.gap_end += n
+
+    def insert(self, pos, data):
+        self._own()
+        self.move_gap(pos)
+        if len(data) > self.gap_end - self.gap_start:
+            grow = max(len(data), len(self.buf))
+            self.buf[self.gap_end:self.gap_end] = bytes(grow)
+            self.gap_end += grow
+        self.buf[self.gap_start:self.gap_start + len(data)] = data
+        self.gap_start += len(data)
+
+    def insert_byte(self, pos, byte):
+        if pos != self.gap_start or self.gap_start == self.gap_end:
+            self.insert(pos, _BYTES[byte])
+            return
+        self.buf[self.gap_start] = byte
+        self.gap_start += 1
+
+    def delete(self, pos, n):
+        self._own()
+        self.move_gap(pos)
+        removed = bytes(self.buf[self.gap_end:self.gap_end + n])
+        self.gap_end += n
+        return removed
+
+    def slice(self, start, end):
+        self.move_gap(end)
+        return bytes(self.buf[start:end])
+
+    def split(self, pos):
+        self._own()
+        self.move_gap(pos)
+        tail = GapBuffer(self.buf[self.gap_end:])
+        self.gap_end = len(self.buf)
+        return tail
+
+    def extend(self, other):
+        self.insert(len(self), other.as_bytes())
+
+    def prev_char(self, pos):
+        pos -= 1
+        while pos > 0 and self[pos] & 0xC0 == 0x80:
+            pos -= 1
+        return pos
+
+    def next_char(self, pos):
+        pos += 1
+        while pos < len(self) and self[pos] & 0xC0 == 0x80:
+            pos += 1
+        return pos
+
+    def boundary(self, pos):
+        pos = min(pos, len(self))
+        while 0 < pos < len(self) and self[pos] & 0xC0 == 0x80:
+            pos -= 1
+        return pos
+
+    def column(self, pos, tab_size):
+        text = self.as_bytes()[:pos].decode("utf-8", "replace")
+        return _display_width(text.expandtabs(tab_size))
+
+    def as_bytes(self):
+        if self.gap_start == self.gap_end:
+            return bytes(self.buf)
+        return bytes(self.buf[:self.gap_start] + self.buf[self.gap_end:])
+
+    def as_str(self):
+        return self.as_bytes().decode("utf-8", "replace")
+
+
+# The buffer's list of lines, split into chunks of about SEGMENT_SIZE so
+# inserting or removing a line shifts one chunk instead of every line
+# after it. Chunk start offsets are rebuilt lazily after a structural edit.
+class SegmentList:
+    def __init__(self, items=()):
+        items = list(items)
+        self.chunks = [items[i:i + SEGMENT_SIZE]
+                       for i in range(0, len(items), SEGMENT_SIZE)] or [[]]
+        self._len = len(items)
+        self._starts = None
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self.chunks)
+
+    def __getitem__(self, idx):
+        ci, off = self._locate(idx)
+        return self.chunks[ci][off]
+
+    def __setitem__(self, idx, item):
+        ci, off = self._locate(idx)
+        self.chunks[ci][off] = item
+
+    def _locate(self, idx):
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError("line index out of range")
+        if self._starts is None:
+            self._starts = list(accumulate(map(len, self.chunks), initial=0))
+        ci = bisect_right(self._starts, idx) - 1
+        return ci, idx - self._starts[ci]
+
+    def insert(self, idx, item):
+        if idx >= self._len:
+            ci, off = len(self.chunks) - 1, len(self.chunks[-1])
+        else:
+            ci, off = self._locate(idx)
+        chunk = self.chunks[ci]
+        chunk.insert(off, item)
+        if len(chunk) > 2 * SEGMENT_SIZE:
+            self.chunks[ci:ci + 1] = [chunk[:SEGMENT_SIZE], chunk[SEGMENT_SIZE:]]
+        self._len += 1
+        self._starts = None
+
+    def pop(self, idx):
+        ci, off = self._locate(idx)
+        chunk = self.chunks[ci]
+        item = chunk.pop(off)
+        if not chunk and len(self.chunks) > 1:
+            del self.chunks[ci]
+        self._len -= 1
+        self._starts = None
+        return item
+
 
 class Editor:
     def __init__(self, stdscr):
         self.stdscr = stdscr
         self.rows, self.cols = stdscr.getmaxyx()
+        self.pad = curses.newpad(PAD_ROWS, self.cols)
+        self._pad_top = 0
+        self._pad_stale = True
+        self._dirty_lines = set()
+        self._gutter_key = None
+        self._prefix_cache = []
+        self._text_x = 0
+        self._menu_key = self._menu_cache = None
+        self._status_key = self._status_cache = None
+        self._dirty_menu = self._dirty_status = True
 
         self.load_config()
 
         self.filename = None
-        self.lines = [""]
+        self.lines = SegmentList([GapBuffer()])
         self.cx = self.cy = 0
         self.scroll = 0
 
-        self.undo_stack = []
-        self.redo_stack = []
+        self.undo_stack = deque(maxlen=UNDO_LIMIT)
+        self.redo_stack = deque(maxlen=UNDO_LIMIT)
+        self._typing = None
+        self._typing_time = 0.0
 
         self.modified = False
+        self._saved = None
+        self.save_error = None
         self.menu_mode = False
         self.active_menu = 0
         self.clipboard = ""
         self.running = True
 
+        self._dispatch = {
+            CTRL_Q: self.quit,
+            CTRL_S: self.save,
+            CTRL_Z: self.undo,
+            CTRL_Y: self.redo,
+            CTRL_L: self.open_menu,
+        }
+        self._menus = {
+            "File": self.file_menu,
+            "Edit": self.edit_menu,
+            "Help": self.help_menu,
+        }
+        self._file_menu_keys = _menu_keys({
+            "n": self.new_file,
+            "o": self.prompt_open,
+            "s": self.save,
+            "q": self.quit,
+        })
+        self._edit_menu_keys = _menu_keys({
+            "z": self.undo,
+            "y": self.redo,
+        })
+
     # ───────────────── CONFIG ─────────────────
 
     def load_config(self):
         if not os.path.exists(CONFIG_PATH):
             self.create_default_config()
 
-        self.config = configparser.ConfigParser()
-        self.config.read(CONFIG_PATH)
+        self.config, settings = _load_config_cached(CONFIG_PATH)
 
-        self.tab_size = int(self.config["editor"].get("tab_size", 4))
-        self.autosave = self.config["editor"].getboolean("autosave")
-        self.show_line_numbers = self.config["editor"].getboolean("show_line_numbers")
+        self.tab_size = settings["tab_size"]
+        self.autosave = settings["autosave"]
+        self.show_line_numbers = settings["show_line_numbers"]
 
     def create_default_config(self):
         cfg = configparser.ConfigParser()
@@ -61,85 +393,250 @@ class Editor:
 
     # ───────────────── UNDO / REDO ─────────────────
 
-    def snapshot(self):
-        self.undo_stack.append((deepcopy(self.lines), self.cx, self.cy))
-        if len(self.undo_stack) > 100:
-            self.undo_stack.pop(0)
+    def edit(self, op):
+        self.apply(op)
+        self.undo_stack.append(op)
         self.redo_stack.clear()
 
+    def line(self, idx):
+        line = self.lines[idx]
+        if line.__class__ is bytes:
+            line = self.lines[idx] = GapBuffer(line, gap=0)
+        return line
+
+    def apply(self, op, inverse=False):
+        kind, cy, cx, *payload = op
+        if inverse:
+            kind = INVERSE_OPS[kind]
+
+        line = self.line(cy)
+        if kind == "ins_char":
+            line.insert(cx, payload[0])
+            self.cy, self.cx = cy, cx + len(payload[0])
+        elif kind == "del_char":
+            line.delete(cx, len(payload[0]))
+            self.cy, self.cx = cy, cx
+        elif kind == "split":
+            self.lines.insert(cy + 1, line.split(cx))
+            self.pad_insert_line(cy + 1)
+            self._dirty_lines.add(cy + 1)
+            self.cy, self.cx = cy + 1, 0
+        elif kind == "join":
+            line.extend(self.line(cy + 1))
+            self.lines.pop(cy + 1)
+            self.pad_delete_line(cy + 1)
+            self.cy, self.cx = cy, cx
+        self._dirty_lines.add(cy)
+        self.modified = True
+
     def undo(self):
         if not self.undo_stack:
             return
-        self.redo_stack.append((deepcopy(self.lines), self.cx, self.cy))
-        self.lines, self.cx, self.cy = self.undo_stack.pop()
+        op = self.undo_stack.pop()
+        self.apply(op, inverse=True)
+        self.redo_stack.append(op)
 
     def redo(self):
         if not self.redo_stack:
             return
-        self.undo_stack.append((deepcopy(self.lines), self.cx, self.cy))
-        self.lines, self.cx, self.cy = self.redo_stack.pop()
+        op = self.redo_stack.pop()
+        self.apply(op)
+        self.undo_stack.append(op)
 
     # ───────────────── DRAWING ─────────────────
 
     def draw(self):
-        self.stdscr.erase()
-        self.draw_menu()
+        # Menu and status rows are only rewritten when something changed
+        # them; the text area is already limited to dirty pad rows.
+        if self._dirty_menu:
+            self.draw_menu()
+            self._dirty_menu = False
         self.draw_text()
         self.draw_status()
-        self.stdscr.refresh()
+        # The pad goes out after stdscr so it owns the text area and the
+        # hardware cursor position.
+        self.stdscr.noutrefresh()
+        self.pad.noutrefresh(self.scroll - self._pad_top, 0,
+                             1, self._text_x, self.rows - 2, self.cols - 1)
+        curses.doupdate()
 
     def draw_menu(self):
-        self.stdscr.attron(curses.A_REVERSE)
-        x = 1
-        for i, m in enumerate(MENU_ITEMS):
-            if self.menu_mode and i == self.active_menu:
-                self.stdscr.attron(curses.A_BOLD)
-            self.stdscr.addstr(0, x, f" {m} ")
-            self.stdscr.attroff(curses.A_BOLD)
-            x += len(m) + 2
-        self.stdscr.addstr(0, x, " " * (self.cols - x))
-        self.stdscr.attroff(curses.A_REVERSE)
+        if self._menu_key != self.cols:
+            self._menu_cache = MENU_BAR.ljust(self.cols - 1)
+            self._menu_key = self.cols
+        self.stdscr.addstr(0, 1, self._menu_cache, curses.A_REVERSE)
+        if self.menu_mode:
+            i = self.active_menu
+            self.stdscr.addstr(0, MENU_OFFSETS[i], MENU_LABELS[i],
+                               curses.A_REVERSE | curses.A_BOLD)
 
     def draw_text(self):
         h = self.rows - 2
+        if not self._pad_top <= self.scroll <= self._pad_top + PAD_ROWS - h:
+            self._pad_top = max(0, self.scroll - (PAD_ROWS - h) // 2)
+            self._pad_stale = True
+        if self._pad_stale:
+            self.pad.erase()
+            end = min(len(self.lines), self._pad_top + PAD_ROWS)
+            self._dirty_lines = set(range(self._pad_top, end))
+            self._pad_stale = False
+
+        # Only lines edited since the last frame are rewritten in the pad;
+        # scrolling within the band just moves the pad's visible window.
+        for idx in self._dirty_lines:
+            row = idx - self._pad_top
+            if not 0 <= row < PAD_ROWS:
+                continue
+            self.pad.move(row, 0)
+            self.pad.clrtoeol()
+            if idx < len(self.lines):
+                # Clip by screen cells, not characters, so tabs and wide
+                # characters never wrap onto the next pad row
+                text = _line_bytes(self.lines[idx]).decode("utf-8", "replace")
+                text = text.expandtabs(self.tab_size)
+                try:
+                    self.pad.addstr(row, 0, _fit(text, self.cols - 1))
+                except curses.error:
+                    pass
+        self._dirty_lines.clear()
+
+        if self.show_line_numbers:
+            self.draw_gutter(h)
+
+        row = self.cy - self._pad_top
+        col = self.line(self.cy).column(self.cx, self.tab_size)
+        if 0 <= row < PAD_ROWS and col < self.cols - self._text_x:
+            self.pad.move(row, col)
+
+    def draw_gutter(self, h):
+        shown = max(0, min(h, len(self.lines) - self.scroll))
+        key = (self.scroll, shown, h)
+        if key == self._gutter_key:
+            return
+        # Prefixes are formatted once per line number, only as far down as
+        # the gutter has been shown, rather than once per row per redraw.
+        end = self.scroll + shown
+        cache = self._prefix_cache
+        if end > len(cache):
+            cache.extend([f"{i + 1:4} " for i in range(len(cache), end)])
+        width = len(cache[end - 1]) if shown else len(f"{1:4} ")
         for i in range(h):
-            idx = i + self.scroll
-            if idx >= len(self.lines):
-                break
-
-            line = self.lines[idx]
-            prefix = ""
-            if self.show_line_numbers:
-                prefix = f"{idx+1:4} "
-
-            self.stdscr.addstr(i + 1, 0, (prefix + line)[:self.cols - 1])
-
-        cy = self.cy - self.scroll + 1
-        cx = self.cx + (5 if self.show_line_numbers else 0)
-        if 1 <= cy < self.rows - 1:
-            self.stdscr.move(cy, cx)
+            prefix = cache[self.scroll + i].rjust(width) if i < shown else " " * width
+            self.stdscr.addstr(i + 1, 0, prefix)
+        self._gutter_key = key
+        self._text_x = width
+
+    def pad_insert_line(self, idx):
+        # Pad rows (and pending dirty lines) below idx move down with the buffer
+        self._dirty_lines = {i + 1 if i >= idx else i for i in self._dirty_lines}
+        row = idx - self._pad_top
+        if row < 0:
+            self._pad_top += 1
+        elif row < PAD_ROWS:
+            self.pad.move(row, 0)
+            self.pad.insertln()
+
+    def pad_delete_line(self, idx):
+        self._dirty_lines = {i - 1 if i > idx else i for i in self._dirty_lines if i != idx}
+        row = idx - self._pad_top
+        if row < 0:
+            self._pad_top -= 1
+        elif row < PAD_ROWS:
+            self.pad.move(row, 0)
+            self.pad.deleteln()
+            self._dirty_lines.add(self._pad_top + PAD_ROWS - 1)
 
     def draw_status(self):
-        name = self.filename if self.filename else "Untitled"
-        mod = "*" if self.modified else ""
-        msg = f"{name}{mod} | Ctrl+S Save | Ctrl+Z Undo | Ctrl+Y Redo | Ctrl+L Menu"
-        self.stdscr.attron(curses.A_REVERSE)
-        self.stdscr.addstr(self.rows - 1, 0, msg.ljust(self.cols - 1))
-        self.stdscr.attroff(curses.A_REVERSE)
+        key = (self.filename, self.modified, self.save_error, self.cols)
+        if key == self._status_key and not self._dirty_status:
+            return
+        if key != self._status_key:
+            name = self.filename if self.filename else "Untitled"
+            mod = "*" if self.modified else ""
+            if self.save_error:
+                msg = f"{name}{mod} | Save failed: {self.save_error}"
+            else:
+                msg = f"{name}{mod} | Ctrl+S Save | Ctrl+Z Undo | Ctrl+Y Redo | Ctrl+L Menu"
+            self._status_cache = msg[:self.cols - 1].ljust(self.cols - 1)
+            self._status_key = key
+        self.stdscr.addstr(self.rows - 1, 0, self._status_cache, curses.A_REVERSE)
+        self._dirty_status = False
 
     # ───────────────── FILE OPS ─────────────────
 
-    def save(self):
+    def save(self, sync=True):
         if not self.filename:
             self.prompt_save_as()
             return
-        with open(self.filename, "w") as f:
-            f.write("\n".join(self.lines))
+        data = b"\n".join(map(_line_bytes, self.lines))
+        saved = (self.filename, hash(data))
+        # Autosave skips the write when the file already holds this content
+        if not sync and saved == self._saved:
+            self.modified = False
+            return
+
+        try:
+            self.write_file(data, sync)
+        except OSError as e:
+            self.save_error = e.strerror or str(e)
+            return
+        self.save_error = None
+        self._saved = saved
         self.modified = False
 
+    def write_file(self, data, sync):
+        path = os.path.realpath(self.filename)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            st = None
+        # Hard-linked files are rewritten in place; replacing them would
+        # split them from their other names.
+        if st is not None and st.st_nlink == 1 and self.replace_file(path, st, data, sync):
+            return
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            _write_all(fd, data, sync)
+        finally:
+            os.close(fd)
+
+    def replace_file(self, path, st, data, sync):
+        # Write a private temp file beside the original and rename it over,
+        # so a failed save never leaves the original truncated. Returns
+        # False without touching the original when the directory is not
+        # writable or the original's owner and group cannot be kept.
+        head, tail = os.path.split(path)
+        try:
+            fd, tmp = tempfile.mkstemp(dir=head, prefix=f".{tail}.")
+        except OSError:
+            return False
+        replaced = False
+        try:
+            try:
+                os.fchown(fd, st.st_uid, st.st_gid)
+            except PermissionError:
+                return False
+            os.fchmod(fd, st.st_mode & 0o7777)
+            _write_all(fd, data, sync)
+            os.close(fd)
+            fd = -1
+            os.replace(tmp, path)
+            replaced = True
+        finally:
+            if fd != -1:
+                os.close(fd)
+            if not replaced:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+        return True
+
     def prompt_save_as(self):
+        self._dirty_status = True
+        self.stdscr.timeout(-1)
         curses.echo()
-        self.stdscr.addstr(self.rows - 1, 0, "Save as: ".ljust(self.cols))
+        self.stdscr.addstr(self.rows - 1, 0, "Save as: ".ljust(self.cols - 1))
         name = self.stdscr.getstr(self.rows - 1, 9).decode()
         curses.noecho()
         if name:
@@ -149,57 +646,82 @@ class Editor:
     # ───────────────── INPUT HANDLER ─────────────────
 
     def handle_input(self, ch):
+        if ch == curses.KEY_RESIZE:
+            self.rows, self.cols = self.stdscr.getmaxyx()
+            self.stdscr.erase()
+            self.pad.resize(PAD_ROWS, self.cols)
+            self._pad_stale = True
+            self._gutter_key = None
+            self._dirty_menu = self._dirty_status = True
+            return
+
         if self.menu_mode:
             self.handle_menu(ch)
             return
 
-        if ch == CTRL('q'):
-            self.running = False
-        elif ch == CTRL('s'):
-            self.save()
-        elif ch == CTRL('z'):
-            self.undo()
-        elif ch == CTRL('y'):
-            self.redo()
-        elif ch == CTRL('l'):
-            self.menu_mode = True
-        elif ch == curses.KEY_LEFT:
-            self.cx = max(0, self.cx - 1)
+        fn = self._dispatch.get(ch)
+        if fn:
+            fn()
+            return
+
+        lines = self.lines
+        cy, cx = self.cy, self.cx
+        line = self.line(cy)
+
+        if ch == curses.KEY_LEFT:
+            if cx > 0:
+                self.cx = line.prev_char(cx)
         elif ch == curses.KEY_RIGHT:
-            self.cx = min(len(self.lines[self.cy]), self.cx + 1)
+            if cx < len(line):
+                self.cx = line.next_char(cx)
         elif ch == curses.KEY_UP:
-            self.cy = max(0, self.cy - 1)
+            if cy > 0:
+                self.cy = cy - 1
+                self.cx = self.line(cy - 1).boundary(cx)
         elif ch == curses.KEY_DOWN:
-            self.cy = min(len(self.lines) - 1, self.cy + 1)
+            if cy < len(lines) - 1:
+                self.cy = cy + 1
+                self.cx = self.line(cy + 1).boundary(cx)
         elif ch in (10, 13):
-            self.snapshot()
-            line = self.lines[self.cy]
-            self.lines[self.cy] = line[:self.cx]
-            self.lines.insert(self.cy + 1, line[self.cx:])
-            self.cx = 0
-            self.cy += 1
-            self.modified = True
+            self.edit(("split", cy, cx))
         elif ch in (8, 127):
-            self.snapshot()
-            if self.cx > 0:
-                line = self.lines[self.cy]
-                self.lines[self.cy] = line[:self.cx - 1] + line[self.cx:]
-                self.cx -= 1
-            elif self.cy > 0:
-                prev = self.lines[self.cy - 1]
-                self.cx = len(prev)
-                self.lines[self.cy - 1] += self.lines[self.cy]
-                del self.lines[self.cy]
-                self.cy -= 1
-            self.modified = True
-        elif 32 <= ch <= 126:
-            self.snapshot()
-            line = self.lines[self.cy]
-            self.lines[self.cy] = line[:self.cx] + chr(ch) + line[self.cx:]
-            self.cx += 1
+            if cx > 0:
+                start = line.prev_char(cx)
+                self.edit(("del_char", cy, start, line.slice(start, cx)))
+            elif cy > 0:
+                self.edit(("join", cy - 1, len(lines[cy - 1])))
+        elif ch < 256 and _PRINTABLE[ch]:
+            # Typing is the hot path: store the byte straight into the
+            # line's gap instead of going through apply().
+            line.insert_byte(cx, ch)
+            self.cx = cx + 1
+            self._dirty_lines.add(cy)
             self.modified = True
 
+            # Consecutive keystrokes extend the ins_char record on top of
+            # the undo stack, so one undo removes the whole typed run.
+            now = time.monotonic()
+            op = self._typing
+            if (op is not None and self.undo_stack and self.undo_stack[-1] is op
+                    and op[1] == cy and op[2] + len(op[3]) == cx
+                    and now - self._typing_time < UNDO_GROUP_TIMEOUT):
+                op[3].append(ch)
+            else:
+                op = ("ins_char", cy, cx, bytearray(_BYTES[ch]))
+                self.undo_stack.append(op)
+                self._typing = op
+            self._typing_time = now
+            self.redo_stack.clear()
+
+    def quit(self):
+        self.running = False
+
+    def open_menu(self):
+        self.menu_mode = True
+        self._dirty_menu = True
+
     def handle_menu(self, ch):
+        self._dirty_menu = True
         if ch in (27,):
             self.menu_mode = False
             return
@@ -208,56 +730,97 @@ class Editor:
         elif ch == curses.KEY_RIGHT:
             self.active_menu = (self.active_menu + 1) % len(MENU_ITEMS)
         elif ch in (10, 13):
-            if MENU_ITEMS[self.active_menu] == "File":
-                self.file_menu()
-            elif MENU_ITEMS[self.active_menu] == "Edit":
-                self.edit_menu()
-            elif MENU_ITEMS[self.active_menu] == "Help":
-                self.help_menu()
+            self._menus[MENU_ITEMS[self.active_menu]]()
             self.menu_mode = False
+            self._dirty_status = True
 
     def file_menu(self):
         self.stdscr.addstr(self.rows - 1, 0, "File: N-New  O-Open  S-Save  Q-Quit")
-        ch = self.stdscr.getch()
-        if ch in (ord('n'), ord('N')):
-            self.lines = [""]
-            self.filename = None
-        elif ch in (ord('o'), ord('O')):
-            self.prompt_open()
-        elif ch in (ord('s'), ord('S')):
-            self.save()
-        elif ch in (ord('q'), ord('Q')):
-            self.running = False
+        self.stdscr.timeout(-1)
+        fn = self._file_menu_keys.get(self.stdscr.getch())
+        if fn:
+            fn()
 
     def edit_menu(self):
         self.stdscr.addstr(self.rows - 1, 0, "Edit: Z-Undo  Y-Redo")
-        ch = self.stdscr.getch()
-        if ch in (ord('z'), ord('Z')):
-            self.undo()
-        elif ch in (ord('y'), ord('Y')):
-            self.redo()
+        self.stdscr.timeout(-1)
+        fn = self._edit_menu_keys.get(self.stdscr.getch())
+        if fn:
+            fn()
 
     def help_menu(self):
         self.stdscr.addstr(self.rows - 1, 0, "CLEdit - Minimal Terminal Editor")
 
+    def new_file(self):
+        self.lines = SegmentList([GapBuffer()])
+        self.filename = None
+        self.cx = self.cy = 0
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self._saved = None
+        self.save_error = None
+        self._pad_stale = True
+
     def prompt_open(self):
+        self._dirty_status = True
+        self.stdscr.timeout(-1)
         curses.echo()
-        self.stdscr.addstr(self.rows - 1, 0, "Open file: ".ljust(self.cols))
+        self.stdscr.addstr(self.rows - 1, 0, "Open file: ".ljust(self.cols - 1))
         path = self.stdscr.getstr(self.rows - 1, 11).decode()
         curses.noecho()
         if path:
-            with open(path) as f:
-                self.lines = f.read().splitlines()
+            lines = []
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size:
+                    # Lines stay undecoded bytes until draw_text renders
+                    # them or line() wraps them for editing.
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        lines = _split_lines(mm)
+            self.lines = SegmentList(lines or [GapBuffer()])
             self.filename = path
+            self.cx = self.cy = 0
+            self.undo_stack.clear()
+            self.redo_stack.clear()
+            self._saved = None
+            self.save_error = None
+            self._pad_stale = True
             self.modified = False
 
     # ───────────────── MAIN LOOP ─────────────────
 
     def run(self):
         self.show_welcome()
+        self.draw()
+        last_draw = time.monotonic()
+        autosave_at = 0.0
+        dirty = draining = False
         while self.running:
-            self.draw()
-            self.handle_input(self.stdscr.getch())
+            # Block while idle; once a key arrives, drain whatever else is
+            # queued (e.g. a paste) and redraw at most once per frame.
+            # Pending autosaves wait for AUTOSAVE_DELAY without keystrokes.
+            pending = self.autosave and self.modified and self.filename
+            if draining:
+                self.stdscr.timeout(0)
+            elif pending:
+                wait = autosave_at - time.monotonic()
+                self.stdscr.timeout(max(0, int(wait * 1000)))
+            else:
+                self.stdscr.timeout(-1)
+            ch = self.stdscr.getch()
+            draining = ch != -1
+            now = time.monotonic()
+            if draining:
+                self.handle_input(ch)
+                autosave_at = now + AUTOSAVE_DELAY
+                dirty = True
+            elif pending and now >= autosave_at:
+                self.save(sync=False)
+                autosave_at = now + AUTOSAVE_DELAY
+                dirty = True
+            if dirty and (not draining or now - last_draw >= FRAME_INTERVAL):
+                self.draw()
+                last_draw = now
+                dirty = False
 
     def show_welcome(self):
         self.stdscr.clear()
@@ -274,6 +837,7 @@ class Editor:
             self.stdscr.addstr(i + 3, 5, line)
         self.stdscr.refresh()
         self.stdscr.getch()
+        self.stdscr.erase()
 
 
 def main(stdscr):
@@ -283,4 +847,7 @@ def main(stdscr):
 
 
 if __name__ == "__main__":
+    # curses waits ESCDELAY ms (1000 by default) to tell a bare Esc from an
+    # escape sequence, which makes closing the menu feel stuck.
+    os.environ.setdefault("ESCDELAY", "25")
     curses.wrapper(main)